@@ -3,6 +3,8 @@ import ast
 from typing import Iterable, List, Union, Dict
 from .models import Allocation, Allocator
 
+LABEL_PATTERN = re.compile(r"^[a-zA-Z_.][a-zA-Z0-9_.]*$")
+
 
 def parse_data(
     data_allocator: Allocator, source_code: str
@@ -21,13 +23,13 @@ def parse_data(
     for line in stream:
         if ":" in line:
             possible_label, remainder = line.split(":", 1)
+            possible_label = possible_label.strip()
 
-            if re.match(r"^[a-zA-Z_.][a-zA-Z0-9_.]*$", possible_label.strip()):
-                current_label_name = possible_label.strip()
+            if LABEL_PATTERN.match(possible_label):
+                current_label_name = possible_label
 
-                # Initialize the list for this label if it doesn't exist
-                if current_label_name not in labels:
-                    labels[current_label_name] = []
+                # Labels without data still show up in the result
+                labels.setdefault(current_label_name, [])
 
                 line = remainder.strip()
 
@@ -36,8 +38,7 @@ def parse_data(
 
         if current_label_name is None:
             current_label_name = "__anonymous_data"
-            if current_label_name not in labels:
-                labels[current_label_name] = []
+            labels.setdefault(current_label_name, [])
 
         parts = line.split(maxsplit=1)
         directive = parts[0]
@@ -104,9 +105,7 @@ def parse_directive(
 
 def strip_comments(stream: Iterable[str]) -> Iterable[str]:
     for line in stream:
-        line = line.split("#", 1)[0]
-        line = line.split("//", 1)[0]
-        line = line.strip()
+        line = line.partition("#")[0].partition("//")[0].strip()
 
         if line:
             yield line
@@ -1,4 +1,4 @@
-from typing import Iterable, List, Set, Optional, Iterator, Union
+from typing import List, Set, Optional, Union
 
 from symbolsresolver import (
     parse_cfg,
@@ -12,6 +12,8 @@ from symbolsresolver import (
 )
 from .models import Function, Label
 
+UNCONDITIONAL_MNEMONICS = frozenset(("jmp", "ret", "iret", "syscall"))
+
 
 def get_linearized_asm(
     asm: str, allocator: Allocator, data_label: str
@@ -28,80 +30,105 @@ def get_linearized_asm(
 def linearize_function(cfg_func: CfgFunction) -> Function:
     """
     Flattens a CFG into a linear sequence, injecting jumps for broken fall-throughs.
+    Jumps made redundant by the final layout are dropped afterwards by
+    `remove_redundant_jumps`.
     """
-    blocks = list(discover_blocks(cfg_func.entry_block))
+    linear_stream: List[Union[Instruction, Label]] = []
+    append = linear_stream.append
+    extend = linear_stream.extend
+
+    for block in discover_blocks(cfg_func.entry_block):
+        append(Label(block.name))
+        extend(block.instructions)
 
-    linear_stream = [
-        instr
-        for i, block in enumerate(blocks)
-        for instr in generate_block_content(
-            block, blocks[i + 1].name if i + 1 < len(blocks) else None
-        )
-    ]
+        jump = fallthrough_jump(block)
+        if jump is not None:
+            append(jump)
 
-    return Function(name=cfg_func.name, instructions=linear_stream)
+    return Function(
+        name=cfg_func.name, instructions=remove_redundant_jumps(linear_stream)
+    )
 
 
-def generate_block_content(
-    block: BasicBlock, physical_next_name: Optional[str]
-) -> Iterator[Union[Instruction, Label]]:
+def fallthrough_jump(block: BasicBlock) -> Optional[Instruction]:
     """
-    Yields the label, original instructions, and any necessary connector jumps
-    for a single block.
+    Returns a `jmp` to the block's logical fall-through (the first successor
+    reached when a conditional jump is NOT taken), or None if the block ends
+    unconditionally or has no fall-through.
     """
-    yield Label(block.name)
+    instructions = block.instructions
+    if instructions and instructions[-1].mnemonic_lower in UNCONDITIONAL_MNEMONICS:
+        return None
+
+    # `link_blocks` always appends the fall-through edge last
+    successors = block.successors
+    if not successors:
+        return None
 
-    if block.instructions:
-        yield from block.instructions
+    if block.successor_edges[-1] is EdgeType.TAKEN:
+        return None
 
-    logical_fallthrough = get_fallthrough_successor(block)
+    succ = successors[-1]
 
-    if (
-        logical_fallthrough
-        and logical_fallthrough.name != physical_next_name
-        and not ends_unconditionally(block)
-    ):
-        jmp_op = MemoryOperand(displacement=Expression(logical_fallthrough.name))
-        yield Instruction("jmp", [jmp_op])
+    jmp_op = MemoryOperand(displacement=Expression(succ.name))
+    return Instruction("jmp", [jmp_op])
 
 
-def discover_blocks(
-    block: BasicBlock, *, visitors: Optional[Set[int]] = None
-) -> Iterable[BasicBlock]:
+def remove_redundant_jumps(
+    stream: List[Union[Instruction, Label]],
+) -> List[Union[Instruction, Label]]:
     """
-    Recursive DFS traversal to find all reachable blocks.
-    Tracks visited blocks by ID to handle cycles.
+    Peephole pass: drops every direct `jmp L` immediately followed by `L:`.
     """
-    if visitors is None:
-        visitors = set()
-
-    if id(block) in visitors:
-        return
-
-    visitors.add(id(block))
+    out: List[Union[Instruction, Label]] = []
+    append = out.append
+    last = len(stream) - 1
+
+    for i, item in enumerate(stream):
+        if (
+            i < last
+            and type(item) is Instruction
+            and item.mnemonic_lower == "jmp"
+            and is_jump_to(item, stream[i + 1])
+        ):
+            continue
+        append(item)
+
+    return out
+
+
+def is_jump_to(jump: Instruction, target: Union[Instruction, Label]) -> bool:
+    """Checks whether `jump` is a direct jump to the label `target`."""
+    if type(target) is not Label or len(jump.operands) != 1:
+        return False
 
-    yield block
+    op = jump.operands[0]
+    return (
+        type(op) is MemoryOperand
+        and op.base is None
+        and op.index is None
+        and str(op.displacement) == target.name
+    )
 
-    for succ, _ in block.successors:
-        yield from discover_blocks(succ, visitors=visitors)
 
+def discover_blocks(block: BasicBlock) -> List[BasicBlock]:
+    """
+    Iterative DFS traversal to find all reachable blocks, entry first.
+    Tracks visited blocks by ID to handle cycles.
+    """
+    blocks: List[BasicBlock] = []
+    visited: Set[int] = set()
+    stack = [block]
 
-def get_fallthrough_successor(block: BasicBlock) -> Optional[BasicBlock]:
-    """Returns the block reached if a conditional jump is NOT taken."""
-    return next(
-        (
-            succ
-            for succ, edge_type in block.successors
-            if edge_type in (EdgeType.NOT_TAKEN, EdgeType.DIRECT)
-        ),
-        None,
-    )
+    while stack:
+        curr = stack.pop()
+        if id(curr) in visited:
+            continue
 
+        visited.add(id(curr))
+        blocks.append(curr)
 
-def ends_unconditionally(block: BasicBlock) -> bool:
-    """Returns True if the block ends with ret, jmp, etc."""
-    if not block.instructions:
-        return False
+        # Reversed so the first successor is popped (and laid out) first
+        stack.extend(reversed(curr.successors))
 
-    last = block.instructions[-1].mnemonic.lower()
-    return last in ["jmp", "ret", "iret", "syscall"]
+    return blocks
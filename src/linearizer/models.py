@@ -3,11 +3,15 @@ from symbolsresolver import Instruction
 from typing import List, Union
 
 
-class Label(str):
-    pass
+@dataclass(slots=True)
+class Label:
+    name: str
+
+    def __str__(self) -> str:
+        return self.name
 
 
-@dataclass
+@dataclass(slots=True)
 class Function:
     name: str
     instructions: List[Union[Instruction, Label]]
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List, Union, assert_never
+from typing import Callable, Dict, List, NamedTuple, Union, cast
 
 
 class Allocation:
@@ -8,10 +8,13 @@ class Allocation:
     Use the factory methods `Allocation.data()` and `Allocation.empty()` to instantiate.
     """
 
+    __slots__ = ("_name", "_offset", "_value", "_handler")
+
     def __init__(self, name: str, offset: int, value: "InternalValueType"):
         self._name = name
         self._offset = offset
         self._value = value
+        self._handler = handler_for(value)
 
     @classmethod
     def with_data(
@@ -45,57 +48,20 @@ class Allocation:
     @property
     def size(self) -> int:
         """Calculates size based on the internal value type."""
-        match self._value:
-            case EmptyValue(size=s):
-                return s
-            case int() | float():
-                return 4
-            case str(v):
-                return len(v) + 1
-            case list(items):
-                return len(items) * 4
-            case x:
-                assert_never(x)
+        return self._handler.size(self._value)
 
     @property
     def directive(self) -> str:
         """Determines the assembly directive based on the internal value type."""
-        match self._value:
-            case EmptyValue():
-                return ".zero"
-            case int():
-                return ".int"
-            case float():
-                return ".float"
-            case str():
-                return ".asciz"
-            case list(items):
-                # If any item is a float, the whole list is treated as floats
-                if any(isinstance(x, float) for x in items):
-                    return ".float"
-                return ".int"
-            case x:
-                assert_never(x)
+        return self._handler.directive(self._value)
 
     def __str__(self) -> str:
         """Generates the assembly line."""
-        val_str = self._format_value()
-        comment = f" # {self._name} (+{self._offset})"
-
-        return f"{self.directive} {val_str}{comment}"
-
-    def _format_value(self) -> str:
-        match self._value:
-            case EmptyValue(size=s):
-                return str(s)
-            case int(v) | float(v):
-                return str(v)
-            case str(v):
-                return f'"{v}"'
-            case list(items):
-                return ", ".join(str(x) for x in items)
-            case x:
-                assert_never(x)
+        handler, value = self._handler, self._value
+        directive = handler.directive(value)
+        formatted = handler.format(value)
+
+        return f"{directive} {formatted} # {self._name} (+{self._offset})"
 
     def __repr__(self) -> str:
         return f"Allocation(name='{self._name}', offset={self._offset}, value={self._value})"
@@ -104,7 +70,7 @@ class Allocation:
 InternalValueType = Union[int, float, str, List[Union[int, float]], "EmptyValue"]
 
 
-@dataclass
+@dataclass(slots=True)
 class EmptyValue:
     """
     Internal class representing empty memory (padding or uninitialized blocks).
@@ -112,3 +78,56 @@ class EmptyValue:
     """
 
     size: int
+
+
+class ValueHandler(NamedTuple):
+    """Size, directive and formatting rules for one kind of stored value."""
+
+    size: Callable[[InternalValueType], int]
+    directive: Callable[[InternalValueType], str]
+    format: Callable[[InternalValueType], str]
+
+
+def _list_directive(items: InternalValueType) -> str:
+    # Only registered for lists; if any item is a float, the whole list is
+    # treated as floats
+    if float in map(type, cast(List[Union[int, float]], items)):
+        return ".float"
+    return ".int"
+
+
+VALUE_HANDLERS: Dict[type, ValueHandler] = {
+    EmptyValue: ValueHandler(
+        size=lambda v: v.size,
+        directive=lambda v: ".zero",
+        format=lambda v: str(v.size),
+    ),
+    int: ValueHandler(size=lambda v: 4, directive=lambda v: ".int", format=str),
+    float: ValueHandler(size=lambda v: 4, directive=lambda v: ".float", format=str),
+    str: ValueHandler(
+        size=lambda v: len(v) + 1,
+        directive=lambda v: ".asciz",
+        format=lambda v: f'"{v}"',
+    ),
+    list: ValueHandler(
+        size=lambda v: len(v) * 4,
+        directive=_list_directive,
+        format=lambda v: ", ".join(map(str, v)),
+    ),
+}
+
+
+def handler_for(value: InternalValueType) -> ValueHandler:
+    """
+    Looks up the handler for a value by its exact type, falling back to the
+    MRO for subclasses (e.g. `bool` is handled as `int`).
+    """
+    handler = VALUE_HANDLERS.get(type(value))
+    if handler is not None:
+        return handler
+
+    for base in type(value).__mro__[1:]:
+        if base in VALUE_HANDLERS:
+            return VALUE_HANDLERS[base]
+
+    raise TypeError(f"Unsupported allocation value: {value!r}")
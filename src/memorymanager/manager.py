@@ -8,6 +8,9 @@ class MemoryManager:
     """
 
     def __init__(self, alignment: int = 4):
+        if alignment <= 0 or alignment & (alignment - 1):
+            raise ValueError("Alignment must be a positive power of two.")
+
         self._alignment = alignment
         self._current_offset = 0
         self._allocations: List[Allocation] = []
@@ -48,8 +51,9 @@ class MemoryManager:
 
     def _ensure_alignment(self):
         """Internal helper to insert padding if the current offset is misaligned."""
-        if self._current_offset % self._alignment != 0:
-            padding_needed = self._alignment - (self._current_offset % self._alignment)
+        # Power-of-two alignment: the distance to the next boundary is a mask
+        padding_needed = -self._current_offset & (self._alignment - 1)
+        if padding_needed:
             pad_name = f"__pad_{self._current_offset}"
 
             pad_alloc = Allocation.empty(pad_name, self._current_offset, padding_needed)
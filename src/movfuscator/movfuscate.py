@@ -1,7 +1,7 @@
-from typing import assert_never
+import io
 from memorymanager import MemoryManager
 import instructionreplacer
-from instructionreplacer import Label, Instruction
+from instructionreplacer import Label
 
 
 def movfuscate(source_code: str) -> str:
@@ -25,35 +25,40 @@ def movfuscate(source_code: str) -> str:
 
 def generate_data_section(memory_manager: MemoryManager, data_label: str) -> str:
     """Generates the assembly lines for the .data section."""
-    lines = [".section .data", f"{data_label}:"]
+    buf = io.StringIO()
+    write = buf.write
+
+    write(f".section .data\n{data_label}:\n")
 
     for alloc in memory_manager.allocations:
-        lines.append(f"    {alloc}")
+        write("    ")
+        write(str(alloc))
+        write("\n")
 
-    return "\n".join(lines) + "\n"
+    return buf.getvalue()
 
 
 def generate_text_section(linearized_functions: list) -> str:
     """Generates the assembly lines for the .text section."""
     lines = [".section .text"]
+    append = lines.append
+    indent = "    "
 
     for func in linearized_functions:
-        lines.append("")
-        lines.append(f".global {func.name}")
+        append("")
+        append(".global " + func.name)
 
         # If the first instruction is a label but not the function name itself,
         # we ensure it gets printed.
         first_item = func.instructions[0]
-        if isinstance(first_item, Label) and first_item != func.name:
-            lines.append(f"{first_item}:")
+        if type(first_item) is Label and first_item.name != func.name:
+            append(first_item.name + ":")
 
         for item in func.instructions:
-            match item:
-                case Label() as label:
-                    lines.append(f"{label}:")
-                case Instruction() as instruction:
-                    lines.append(f"    {instruction}")
-                case x:
-                    assert_never(x)
-
-    return "\n".join(lines) + "\n"
+            if type(item) is Label:
+                append(item.name + ":")
+            else:
+                append(indent + str(item))
+
+    append("")
+    return "\n".join(lines)
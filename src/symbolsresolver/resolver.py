@@ -1,5 +1,4 @@
-from typing import Iterable, List, Dict, Optional, Set, Union
-from itertools import chain
+from typing import Iterable, List, Dict, Mapping, Optional, Set, Union
 from dataparser import Allocator, parse_data
 from textparser import (
     Function,
@@ -29,14 +28,22 @@ def parse_cfg(asm: str, allocator: Allocator, data_label: str) -> List[Function]
     """
     data_map = parse_data(allocator, asm)
 
-    label_offsets: Dict[str, int] = dict(
-        (name, allocations[0].offset) for name, allocations in data_map.items()
-    )
+    # Built once and shared by every operand: each variable is replaced by
+    # the data label plus its allocated offset.
+    replacements: Dict[str, Expression] = {
+        name: Expression(data_label) + allocations[0].offset
+        for name, allocations in data_map.items()
+    }
 
     functions = parse_text_cfg(asm)
 
-    for instruction in chain(*map(lambda func: instructions(func), functions)):
-        resolve_instruction(instruction, label_offsets, data_label)
+    # Shared across functions so a block reachable from several entry
+    # points is only resolved once.
+    visited: Set[int] = set()
+
+    for func in functions:
+        for instruction in instructions(func, visited=visited):
+            resolve_instruction(instruction, replacements)
 
     return functions
 
@@ -44,57 +51,67 @@ def parse_cfg(asm: str, allocator: Allocator, data_label: str) -> List[Function]
 def instructions(
     func: Union[Function, BasicBlock], *, visited: Optional[Set[int]] = None
 ) -> Iterable[Instruction]:
+    """
+    Yields every instruction reachable from a function's entry block.
+    Uses an explicit stack instead of recursion; blocks are tracked by ID
+    since `BasicBlock` is not hashable. Blocks already in `visited` are
+    skipped, which lets callers share one set across several functions.
+    """
     if visited is None:
         visited = set()
 
-    if isinstance(func, Function):
-        yield from instructions(func.entry_block, visited=visited)
-        return
+    entry = func.entry_block if isinstance(func, Function) else func
+    stack = [entry]
 
-    if id(func) in visited:
-        return
+    while stack:
+        block = stack.pop()
+        if id(block) in visited:
+            continue
 
-    visited.add(id(func))
+        visited.add(id(block))
 
-    yield from func.instructions
+        yield from block.instructions
 
-    for adjacent_block in map(lambda x: x[0], func.successors):
-        yield from instructions(adjacent_block, visited=visited)
+        stack.extend(reversed(block.successors))
 
 
-def resolve_instruction(
-    instr: Instruction, label_offsets: Dict[str, int], data_label: str
-):
+def resolve_instruction(instr: Instruction, replacements: Mapping[str, Expression]):
     """
     Updates an instruction's operands by resolving symbols to offsets.
     Mutates the instruction in place.
     """
-    instr.operands = [
-        resolve_operand(op, label_offsets, data_label) for op in instr.operands
-    ]
+    resolved = [resolve_operand(op, replacements) for op in instr.operands]
 
+    if any(new is not old for new, old in zip(resolved, instr.operands)):
+        instr.operands = resolved
 
-def resolve_operand(
-    op: Operand, label_offsets: Dict[str, int], data_label: str
-) -> Operand:
+
+def resolve_operand(op: Operand, replacements: Mapping[str, Expression]) -> Operand:
     """
-    Returns a new Operand with expressions resolved.
+    Returns a new Operand with expressions resolved, or `op` itself if
+    nothing in it needed resolving.
     """
     match op:
         case ImmediateOperand(expr):
-            return ImmediateOperand(resolve_expression(expr, label_offsets, data_label))
+            resolved = resolve_expression(expr, replacements)
+            if resolved is expr:
+                return op
+
+            return ImmediateOperand(resolved)
 
         case MemoryOperand(base, index, scale, disp):
-            return MemoryOperand(
-                base, index, scale, resolve_expression(disp, label_offsets, data_label)
-            )
+            resolved = resolve_expression(disp, replacements)
+            if resolved is disp:
+                return op
+
+            return MemoryOperand(base, index, scale, resolved)
 
         case op:
             return op
 
 
 def resolve_expression(
-    expr: Expression, label_offsets: Dict[str, int], data_label: str
+    expr: Expression, replacements: Mapping[str, Expression]
 ) -> Expression:
     """
     Algebraically substitutes symbols in the expression.
@@ -105,14 +122,18 @@ def resolve_expression(
     Example:
         If 'counter' is at offset 4 and MasterLabel is '__MEM':
         Expression("counter") -> Expression("__MEM") + 4
-    """
-    result = Expression(expr)
 
-    symbols_to_resolve = [s for s in result.symbols if s in label_offsets]
+    Returns `expr` itself when none of its symbols are resolvable.
+    """
+    # Pure constants and expressions without data symbols are the common
+    # case: hand back the original instead of a copy.
+    if expr.is_scalar:
+        return expr
 
-    for sym in symbols_to_resolve:
-        offset = label_offsets[sym]
+    if replacements.keys().isdisjoint(expr.symbol_names):
+        return expr
 
-        result.substitute_term(sym, Expression(data_label) + offset)
+    result = Expression(expr)
+    result.substitute_terms(replacements)
 
     return result
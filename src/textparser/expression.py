@@ -1,6 +1,7 @@
 import re
-from collections import defaultdict
-from typing import Optional, List, Union, Dict, assert_never
+import sys
+from functools import lru_cache
+from typing import Optional, KeysView, List, Mapping, Union, Dict, assert_never
 
 
 class Expression:
@@ -17,21 +18,28 @@ class Expression:
         - To rebase an offset into a section: Expression(offset) + "DATA_START"
     """
 
+    __slots__ = ("_constant", "_terms", "_str_cache")
+
     def __init__(self, value: Union[int, str, "Expression"] = 0):
         # The constant integer component of the expression (C)
         self._constant: int = 0
         # The map of symbolic terms: { "symbol_name": coefficient }
-        self._terms: Dict[str, int] = defaultdict(int)
+        # Zero coefficients are never stored.
+        self._terms: Dict[str, int] = {}
+        # Memoized `__str__` output; cleared whenever the expression is mutated
+        self._str_cache: Optional[str] = None
 
         match value:
             case int(x):
                 self._constant = x
             case str(x):
-                # A raw string is treated as 1 * Symbol
-                self._terms[x] = 1
+                # A raw string is treated as 1 * Symbol. Interned, so the
+                # same label from different parses shares one key object.
+                self._terms[sys.intern(x)] = 1
             case Expression() as x:
                 self._constant = x._constant
                 self._terms = x._terms.copy()
+                self._str_cache = x._str_cache
             case x:
                 assert_never(x)
 
@@ -40,90 +48,89 @@ class Expression:
         """
         Parses a string representation of a linear expression (e.g., "A + 2*B - 5").
         Supports: Integers, Symbols, +, -, *, and Parentheses.
+
+        Parse results are cached; each call returns a fresh copy, so callers
+        are free to mutate it.
         """
+        return _parse_cached(text.strip())._copy()
+
+    @staticmethod
+    def _parse(text: str) -> "Expression":
+        # Single-pass operator-precedence (shunting-yard) parse. Integer-only
+        # subexpressions are folded into plain ints as they are reduced; an
+        # Expression is only built once a symbol is involved.
+        tokens = _tokenize(text)
+        if not tokens:
+            return Expression(0)
 
-        tokens: List[str] = [
-            t for t in re.split(r"([+*\-()])|\s+", text) if t and t.strip()
-        ]
-        cursor = 0
-
-        def peek() -> Optional[str]:
-            return tokens[cursor] if cursor < len(tokens) else None
-
-        def consume(expected: Optional[str] = None) -> Optional[str]:
-            nonlocal cursor
-            token = peek()
-            if expected and token != expected:
-                raise ValueError(
-                    f"Expected '{expected}', got '{token}' at position {cursor}"
-                )
-            cursor += 1
-            return token
-
-        def parse_expr() -> "Expression":
-            # Expr -> Term { (+|-) Term }
-            node = parse_term()
-            while peek() in ("+", "-"):
-                op = consume()
-                rhs = parse_term()
-                if op == "+":
-                    node = node + rhs
+        operands: List[Union["Expression", int]] = []
+        ops: List[str] = []
+
+        def reduce(op: str) -> None:
+            rhs = operands.pop()
+            if op == "u-":
+                operands.append(-rhs if isinstance(rhs, int) else rhs * -1)
+                return
+
+            lhs = operands.pop()
+            if op == "+":
+                operands.append(lhs + rhs)
+            elif op == "-":
+                operands.append(lhs - rhs)
+            elif isinstance(lhs, int):
+                operands.append(rhs * lhs)
+            elif isinstance(rhs, int):
+                operands.append(lhs * rhs)
+            else:
+                raise ValueError("Non-linear error: Cannot multiply two symbols.")
+
+        # Alternates between expecting an operand (prefix position) and
+        # expecting an operator (after a complete operand).
+        expect_operand = True
+        for cursor, token in enumerate(tokens):
+            if expect_operand:
+                if token == "(":
+                    ops.append(token)
+                elif token == "-":
+                    ops.append("u-")  # Unary minus
+                elif token == "+":
+                    pass  # Unary plus
+                elif token.isdigit():
+                    operands.append(int(token))
+                    expect_operand = False
+                elif _IDENTIFIER_PATTERN.fullmatch(token):
+                    operands.append(Expression(token))
+                    expect_operand = False
                 else:
-                    node = node - rhs
-            return node
-
-        def parse_term() -> "Expression":
-            # Term -> Factor { * Factor }
-            node = parse_factor()
-            while peek() == "*":
-                consume()
-                rhs = parse_factor()
-
-                match (node, rhs):
-                    case (Expression(), Expression()):
-                        raise ValueError(
-                            "Non-linear error: Cannot multiply two symbols."
-                        )
-                    case Expression() as x, y:
-                        node = x * y
-                    case x, y:
-                        node = x * y
-
-            return Expression(node)
-
-        def parse_factor() -> Union["Expression", int]:
-            # Factor -> ( Expr ) | - Factor | + Factor | Integer | Symbol
-            token = peek()
-            if token is None:
-                raise ValueError("Unexpected end of expression")
-
-            if token == "(":
-                consume()
-                e = parse_expr()
-                consume(")")
-                return e
-            elif token == "-":
-                consume()
-                return Expression(0) - parse_factor()  # Unary minus
-            elif token == "+":
-                consume()
-                return parse_factor()  # Unary plus
-            elif token.isdigit() or (token.startswith("-") and token[1:].isdigit()):
-                consume()
-                return int(token)
-            elif re.match(r"^[a-zA-Z_.][a-zA-Z0-9_.]*$", token):
-                consume()
-                return Expression(token)
+                    raise ValueError(f"Unexpected token: {token}")
+
+            elif token in _PRECEDENCE:
+                precedence = _PRECEDENCE[token]
+                while ops and ops[-1] != "(" and _PRECEDENCE[ops[-1]] >= precedence:
+                    reduce(ops.pop())
+                ops.append(token)
+                expect_operand = True
+
+            elif token == ")" and "(" in ops:
+                while (op := ops.pop()) != "(":
+                    reduce(op)
+
             else:
-                raise ValueError(f"Unexpected token: {token}")
+                # Unmatched ')' or an operand where an operator was expected
+                raise ValueError(f"Unexpected extra tokens: {tokens[cursor:]}")
 
-        if not tokens:
-            return Expression(0)
+        if expect_operand:
+            raise ValueError("Unexpected end of expression")
 
-        result = parse_expr()
-        if cursor < len(tokens):
-            raise ValueError(f"Unexpected extra tokens: {tokens[cursor:]}")
-        return result
+        while ops:
+            op = ops.pop()
+            if op == "(":
+                raise ValueError(f"Unclosed '(' in expression: {text!r}")
+            reduce(op)
+
+        # Intermediate results are already fresh Expressions; only wrap ints
+        (result,) = operands
+        return result if isinstance(result, Expression) else Expression(result)
 
     @property
     def is_scalar(self) -> bool:
@@ -131,9 +138,14 @@ class Expression:
         return len(self._terms) == 0
 
     @property
-    def symbols(self):
+    def symbols(self) -> List[str]:
         return list(self._terms.keys())
 
+    @property
+    def symbol_names(self) -> KeysView[str]:
+        """Live, non-copying view of the symbols; do not mutate while iterating it."""
+        return self._terms.keys()
+
     def substitute_term(self, term: str, value: Union[int, "Expression"]):
         """
         Replaces a symbol in the expression with an integer or another Expression.
@@ -143,10 +155,11 @@ class Expression:
             term: The symbol name to replace.
             value: The replacement (int or Expression).
         """
-        if term not in self._terms:
+        coefficient = self._terms.pop(term, None)
+        if coefficient is None:
             return
 
-        coefficient = self._terms.pop(term)
+        self._str_cache = None
 
         match value:
             case int(v):
@@ -155,50 +168,97 @@ class Expression:
             case Expression() as v:
                 self._constant += v._constant * coefficient
 
+                terms = self._terms
                 for sub_term, sub_coeff in v._terms.items():
-                    self._terms[sub_term] += sub_coeff * coefficient
+                    _accumulate(terms, sub_term, sub_coeff * coefficient)
 
             case x:
                 assert_never(x)
 
-        self._cleanup()
+    def substitute_terms(self, mapping: Mapping[str, Union[int, "Expression"]]):
+        """
+        Replaces every symbol found in `mapping` in a single pass.
+        Modifies the expression in-place.
+
+        Substitution is simultaneous: symbols introduced by a replacement are
+        not substituted again, even if they also appear in `mapping`.
+        """
+        terms = self._terms
+        hits = [(sym, terms[sym]) for sym in terms if sym in mapping]
+        if not hits:
+            return
+
+        self._str_cache = None
+
+        for sym, _ in hits:
+            del terms[sym]
+
+        for sym, coefficient in hits:
+            value = mapping[sym]
+            if isinstance(value, int):
+                self._constant += value * coefficient
+            else:
+                self._constant += value._constant * coefficient
+                for sub_term, sub_coeff in value._terms.items():
+                    _accumulate(terms, sub_term, sub_coeff * coefficient)
+
+    @classmethod
+    def _make(cls, constant: int, terms: Dict[str, int]) -> "Expression":
+        """Builds an instance directly from already-clean components."""
+        result = object.__new__(cls)
+        result._constant = constant
+        result._terms = terms
+        result._str_cache = None
+        return result
+
+    def _copy(self) -> "Expression":
+        """Cheap copy that skips `__init__`'s type dispatch."""
+        result = Expression._make(self._constant, self._terms.copy())
+        result._str_cache = self._str_cache
+        return result
 
     def __add__(self, other: Union["Expression", str, int]) -> "Expression":
-        result = Expression(self)
+        if other == 0:
+            return self._copy()
+
+        constant, terms = self._constant, self._terms.copy()
 
         match other:
             case int(x):
-                result._constant += x
+                constant += x
             case str(x):
-                result._terms[x] += 1
+                _accumulate(terms, x, 1)
             case Expression() as x:
-                result._constant += x._constant
+                constant += x._constant
                 for sym, coeff in x._terms.items():
-                    result._terms[sym] += coeff
+                    _accumulate(terms, sym, coeff)
             case x:
                 assert_never(x)
 
-        return result._cleanup()
+        return Expression._make(constant, terms)
 
     def __radd__(self, other) -> "Expression":
         return self.__add__(other)
 
     def __sub__(self, other: Union["Expression", str, int]) -> "Expression":
-        result = Expression(self)
+        if other == 0:
+            return self._copy()
+
+        constant, terms = self._constant, self._terms.copy()
 
         match other:
             case int(x):
-                result._constant -= x
+                constant -= x
             case str(x):
-                result._terms[x] -= 1
+                _accumulate(terms, x, -1)
             case Expression() as x:
-                result._constant -= x._constant
+                constant -= x._constant
                 for sym, coeff in x._terms.items():
-                    result._terms[sym] -= coeff
+                    _accumulate(terms, sym, -coeff)
             case x:
                 assert_never(x)
 
-        return result._cleanup()
+        return Expression._make(constant, terms)
 
     def __rsub__(self, other) -> "Expression":
         # int - expr  OR  str - expr
@@ -206,49 +266,96 @@ class Expression:
 
     def __mul__(self, other: int) -> "Expression":
         # Supports scaling linear expressions (e.g. index * 4)
-        result = Expression(self)
-        result._constant *= other
-        for sym in result._terms:
-            result._terms[sym] *= other
-        return result._cleanup()
+        if other == 0:
+            return Expression._make(0, {})
+        if other == 1:
+            return self._copy()
+
+        terms = {sym: coeff * other for sym, coeff in self._terms.items()}
+        return Expression._make(self._constant * other, terms)
 
     def __rmul__(self, other: int) -> "Expression":
         return self.__mul__(other)
 
-    def _cleanup(self) -> "Expression":
-        """Removes terms with zero coefficients (e.g. 'A - A')."""
-        cleaned = {sym: coeff for sym, coeff in self._terms.items() if coeff != 0}
-        self._terms = defaultdict(int, cleaned)
-        return self
+    def __eq__(self, other: object) -> bool:
+        # Only Expressions compare structurally; `expr == 0` stays False.
+        # Expressions are mutated in place, so defining `__eq__` deliberately
+        # leaves them unhashable.
+        if not isinstance(other, Expression):
+            return NotImplemented
+        return self._constant == other._constant and self._terms == other._terms
 
     def __str__(self) -> str:
         """
         Emits standard AT&T/GAS syntax suitable for re-injection.
         """
-        if self.is_scalar:
-            return str(self._constant)
+        if self._str_cache is None:
+            self._str_cache = self._format()
+        return self._str_cache
 
-        parts = []
+    def _format(self) -> str:
+        terms = self._terms
+        if not terms:
+            return str(self._constant)
 
-        # Sort terms for deterministic output
-        for sym, coeff in sorted(self._terms.items()):
-            if coeff == 1:
-                parts.append(sym)
-            elif coeff == -1:
-                parts.append(f"-{sym}")
-            else:
-                parts.append(f"{coeff}*{sym}")
+        # A lone symbol (e.g. a label) needs neither sorting nor joining
+        if len(terms) == 1 and self._constant == 0:
+            ((sym, coeff),) = terms.items()
+            return _format_term(sym, coeff)
+
+        # Sort terms for deterministic output. Signs are emitted directly:
+        # negative coefficients carry their own '-', so only positive
+        # terms after the first need a '+'.
+        parts: List[str] = []
+        append = parts.append
+        for sym, coeff in sorted(terms.items()):
+            if coeff > 0 and parts:
+                append("+")
+            append(_format_term(sym, coeff))
 
         # Append the constant term if it exists
-        if self._constant > 0:
-            parts.append(f"{self._constant}")
-        elif self._constant < 0:
-            parts.append(f"{self._constant}")
-
-        # Join and clean up syntax (e.g., "A+-5" -> "A-5")
-        res = "+".join(parts).replace("+-", "-")
+        constant = self._constant
+        if constant > 0:
+            append("+")
+        if constant:
+            append(str(constant))
 
-        return res if res else "0"
+        return "".join(parts)
 
     def __repr__(self):
         return f"Expr(constant={self._constant}, terms={dict(self._terms)})"
+
+
+_parse_cached = lru_cache(maxsize=4096)(Expression._parse)
+
+
+# Binding strength of each operator; "u-" is prefix negation
+_PRECEDENCE = {"+": 1, "-": 1, "*": 2, "u-": 3}
+_TOKEN_PATTERN = re.compile(r"[-+*()]|[^-+*()\s]+")
+_IDENTIFIER_PATTERN = re.compile(r"[a-zA-Z_.][a-zA-Z0-9_.]*")
+
+
+def _tokenize(text: str) -> List[str]:
+    """
+    Splits an expression into operator characters and runs of everything else,
+    skipping whitespace. Runs containing unexpected characters (e.g. '%') are
+    left for the parser to reject.
+    """
+    return _TOKEN_PATTERN.findall(text)
+
+
+def _format_term(sym: str, coeff: int) -> str:
+    if coeff == 1:
+        return sym
+    if coeff == -1:
+        return "-" + sym
+    return str(coeff) + "*" + sym
+
+
+def _accumulate(terms: Dict[str, int], sym: str, coeff: int) -> None:
+    """Adds `coeff` to a term in place, dropping it if it cancels out (e.g. 'A - A')."""
+    total = terms.get(sym, 0) + coeff
+    if total:
+        terms[sym] = total
+    else:
+        terms.pop(sym, None)
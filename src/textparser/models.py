@@ -1,6 +1,7 @@
+import sys
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Tuple, Optional, Literal, Union
+from typing import List, Optional, Literal, Union
 from .expression import Expression
 
 
@@ -50,7 +51,7 @@ class RegisterOperand(Enum):
         return self.value
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ImmediateOperand:
     value: Expression
 
@@ -59,12 +60,13 @@ class ImmediateOperand:
         return f"$({self.value})"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MemoryOperand:
     base: Optional[RegisterOperand] = None
     index: Optional[RegisterOperand] = None
     scale: Literal[1, 2, 4, 8] = 1
-    displacement: Expression = Expression("0")
+    # A factory, since Expressions are mutable (and therefore unhashable)
+    displacement: Expression = field(default_factory=lambda: Expression("0"))
 
     def __str__(self) -> str:
         if self.displacement == 0 and (self.base is not None or self.index is not None):
@@ -92,25 +94,46 @@ class MemoryOperand:
 Operand = Union[MemoryOperand, RegisterOperand, ImmediateOperand]
 
 
-@dataclass
+@dataclass(slots=True)
 class Instruction:
     mnemonic: str
     operands: List[Operand] = field(default_factory=list)
     line_number: int = 0
+    # Lowercased and interned once at construction so control-flow checks
+    # don't have to re-normalize the mnemonic on every call, and lookups in
+    # the mnemonic tables hit the identity fast path. Derived state: treat
+    # `mnemonic` as read-only and rename through `set_mnemonic`.
+    mnemonic_lower: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.mnemonic_lower = sys.intern(self.mnemonic.lower())
+
+    def set_mnemonic(self, mnemonic: str) -> None:
+        """Renames the instruction, keeping `mnemonic_lower` in sync."""
+        self.mnemonic = mnemonic
+        self.mnemonic_lower = sys.intern(mnemonic.lower())
 
     def __str__(self):
-        ops = ", ".join(str(x) for x in self.operands)
-        return f"{self.mnemonic} {ops}" if ops else self.mnemonic
+        if not self.operands:
+            return self.mnemonic
+        return self.mnemonic + " " + ", ".join(map(str, self.operands))
 
 
-@dataclass
+@dataclass(slots=True)
 class BasicBlock:
     name: str
     instructions: List[Instruction] = field(default_factory=list)
-    successors: List[Tuple["BasicBlock", EdgeType]] = field(default_factory=list)
+    # Parallel lists: `successor_edges[i]` is the edge type to `successors[i]`.
+    # Use `add_successor` to keep them in step.
+    successors: List["BasicBlock"] = field(default_factory=list)
+    successor_edges: List[EdgeType] = field(default_factory=list)
+
+    def add_successor(self, block: "BasicBlock", edge_type: EdgeType) -> None:
+        self.successors.append(block)
+        self.successor_edges.append(edge_type)
 
 
-@dataclass
+@dataclass(slots=True)
 class Function:
     name: str
     entry_block: BasicBlock
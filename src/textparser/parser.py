@@ -1,5 +1,9 @@
 import re
-from typing import Iterator, List, Optional, Set, Tuple, Union, assert_never
+import sys
+from collections import deque
+from dataclasses import replace
+from functools import lru_cache
+from typing import Dict, Iterator, List, Literal, Optional, Set, Tuple, Union
 from .models import (
     BasicBlock,
     Instruction,
@@ -18,10 +22,7 @@ def parse_cfg(source_code: str) -> List[Function]:
     Parses assembly source code and returns a list of detected Functions.
     Each Function contains a name and an entry BasicBlock.
     """
-    stream = iter_source_lines(source_code)
-    stream = strip_comments(stream)
-    stream = filter_text_section(stream)
-    elements = parse_elements(stream)
+    elements = parse_elements(iter_text_lines(source_code))
 
     blocks = build_blocks(elements)
 
@@ -46,45 +47,57 @@ def extract_functions(blocks: List[BasicBlock]) -> List[Function]:
         func = Function(name=block.name, entry_block=block)
         functions.append(func)
 
-        queue = [block]
+        # Blocks are marked when enqueued, so each is processed exactly once
+        visited.add(id(block))
+        queue = deque([block])
         while queue:
-            curr = queue.pop(0)
-            if curr.name in visited:
-                continue
+            curr = queue.popleft()
 
-            visited.add(id(curr))
-
-            for succ_block, _ in curr.successors:
-                if id(succ_block) not in visited:
+            for succ_block in curr.successors:
+                succ_id = id(succ_block)
+                if succ_id not in visited:
+                    visited.add(succ_id)
                     queue.append(succ_block)
 
     return functions
 
 
-def strip_comments(
-    source_stream: Iterator[Tuple[int, str]],
-) -> Iterator[Tuple[int, str]]:
-    for line_num, line in source_stream:
-        line = line.split("#", 1)[0]
-        line = line.split("//", 1)[0]
-        line = line.strip()
-        if line:
-            yield line_num, line
+NON_TEXT_SECTIONS = frozenset((".data", ".bss"))
+# A comment runs up to the next line break. '.' would also match characters
+# that `str.splitlines` treats as line breaks (e.g. '\r'), so every one of
+# them is excluded explicitly.
+COMMENT_PATTERN = re.compile(r"(?:#|//)[^\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]*")
 
 
-def filter_text_section(
-    source_stream: Iterator[Tuple[int, str]],
-) -> Iterator[Tuple[int, str]]:
+def iter_text_lines(source_code: str) -> Iterator[Tuple[int, str]]:
+    """
+    Yields `(line_number, line)` for every non-empty line inside a text
+    section, with comments and surrounding whitespace removed.
+    """
+    # Every text section directive contains ".text"
+    if ".text" not in source_code:
+        return
+
+    # Comments are removed from the whole source up front; line breaks are
+    # kept, so line numbers are unaffected.
+    source_code = COMMENT_PATTERN.sub("", source_code)
+
     in_text_section = False
-    for line_num, line in source_stream:
-        if line.startswith(".section .text") or line == ".text":
-            in_text_section = True
+    for line_num, line in enumerate(source_code.splitlines(), 1):
+        # Outside a text section only a section directive matters, and those
+        # always contain a '.'; skip everything else without stripping it.
+        if not in_text_section and "." not in line:
             continue
-        elif line.startswith(".section") or line in [".data", ".bss"]:
-            in_text_section = False
+
+        line = line.strip()
+        if not line:
             continue
 
-        if in_text_section:
+        if line.startswith(".section .text") or line == ".text":
+            in_text_section = True
+        elif line.startswith(".section") or line in NON_TEXT_SECTIONS:
+            in_text_section = False
+        elif in_text_section:
             yield line_num, line
 
 
@@ -95,20 +108,25 @@ def parse_elements(
     Transforms raw source lines into a stream of parsed elements.
     Yields `str` for labels and `Instruction` objects for code.
     """
+    # Label names and mnemonics repeat heavily and are used as dict keys and
+    # compared downstream, so they are interned once here.
     for line_num, line in source_stream:
-        if line.endswith(":"):
-            yield line[:-1]
+        if line[-1] == ":":
+            yield sys.intern(line[:-1])
             continue
 
-        parts = line.split(maxsplit=1)
-        mnemonic = parts[0]
-
-        if mnemonic.startswith("."):
+        if line[0] == ".":
             continue  # do not parse assembler directives
 
+        head, sep, rest = line.partition(" ")
+        if "\t" in head:
+            head, sep, rest = line.partition("\t")
+
+        mnemonic = sys.intern(head)
+
         operands: List[Operand] = []
-        if len(parts) > 1:
-            raw_operands = split_operands_source(parts[1])
+        if sep:
+            raw_operands = split_operands_source(rest)
             operands = [parse_operand(op) for op in raw_operands]
 
         yield Instruction(mnemonic, operands, line_number=line_num)
@@ -119,61 +137,70 @@ def split_operands_source(text: str) -> List[str]:
     Splits an operand string by comma, ignoring commas inside parentheses.
     E.g., "4(%eax, %ebx), $10" -> ["4(%eax, %ebx)", "$10"]
     """
+    if "(" not in text:
+        # No parentheses means every comma separates operands
+        return [p for p in map(str.strip, text.split(",")) if p]
+
+    # Track paren depth and slice each operand out at top-level commas
     parts = []
-    current = []
+    start = 0
     depth = 0
-    for char in text:
-        if char == "," and depth == 0:
-            parts.append("".join(current).strip())
-            current = []
-        else:
-            if char == "(":
-                depth += 1
-            elif char == ")":
-                depth -= 1
-            current.append(char)
-
-    if current:
-        parts.append("".join(current).strip())
+    for i, char in enumerate(text):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(text[start:i].strip())
+            start = i + 1
+
+    parts.append(text[start:].strip())
 
     return [p for p in parts if p]
 
 
+# RegisterOperand values include the '%' (e.g., "%eax")
+REGISTERS: Dict[str, RegisterOperand] = {r.value: r for r in RegisterOperand}
+
+SCALES: Dict[str, Literal[1, 2, 4, 8]] = {"1": 1, "2": 2, "4": 4, "8": 8}
+
+
 def parse_operand(text: str) -> Operand:
     """
     Parses a single operand string into the appropriate Operand model.
+    The parse itself is cached; each call gets its own copy of the operand's
+    Expression, so callers are free to mutate it.
     """
-    text = text.strip()
+    operand = _parse_operand_cached(text)
 
-    # 1. Try Register
-    try:
-        # RegisterOperand definitions include the '%' (e.g., "%eax")
-        return RegisterOperand(text.lower())
-    except ValueError:
-        pass
+    if isinstance(operand, ImmediateOperand):
+        return ImmediateOperand(operand.value._copy())
+    if isinstance(operand, MemoryOperand):
+        return replace(operand, displacement=operand.displacement._copy())
+    return operand
 
-    # 2. Try Immediate
-    if text.startswith("$"):
+
+@lru_cache(maxsize=65536)
+def _parse_operand_cached(text: str) -> Operand:
+    # Results are shared between calls, which is why the operand models are
+    # frozen; never hand them out without copying the Expression.
+    text = text.strip()
+
+    # 1. Try Immediate
+    if text[:1] == "$":
         # Parse expression after '$'
         return ImmediateOperand(Expression.parse(text[1:]))
 
+    # 2. Try Register
+    register = REGISTERS.get(text.lower())
+    if register is not None:
+        return register
+
     # 3. Memory (or Label/Direct Address)
     # Syntax: displacement(base, index, scale)
-    # Regex Breakdown:
-    #   ^          Start
-    #   (.*?)      Group 1: Displacement (lazy match until parens)
-    #   (?:        Non-capturing group for parens part
-    #     \(       Literal '('
-    #     (.*)     Group 2: Content inside parens
-    #     \)       Literal ')'
-    #   )?         Parens part is optional
-    #   $          End
-    match = re.match(r"^(.*?)(\((.*)\))?$", text)
-    if not match:
-        # Fallback: Treat whole string as displacement expression
-        return MemoryOperand(displacement=Expression.parse(text))
-
-    disp_str, _, paren_content = match.groups()
+    # The parenthesized part starts at the first '(' and is only recognized
+    # if the operand ends with ')'; otherwise the whole text is displacement.
+    disp_str, paren_content = split_memory_operand(text)
 
     displacement = (
         Expression.parse(disp_str) if disp_str and disp_str.strip() else Expression(0)
@@ -198,7 +225,10 @@ def parse_operand(text: str) -> Operand:
     def get_reg(s: str) -> Optional[RegisterOperand]:
         if not s:
             return None
-        return RegisterOperand(s.lower())
+        register = REGISTERS.get(s.lower())
+        if register is None:
+            raise ValueError(f"Unknown register: {s}")
+        return register
 
     if len(sub_parts) >= 1:
         base = get_reg(sub_parts[0])
@@ -207,16 +237,40 @@ def parse_operand(text: str) -> Operand:
         index = get_reg(sub_parts[1])
 
     if len(sub_parts) == 3 and sub_parts[2]:
-        try:
-            scale = int(sub_parts[2])
-            if scale not in (1, 2, 4, 8):
-                raise ValueError
-        except ValueError:
-            raise ValueError(f"Invalid scale factor: {sub_parts[2]}")
+        valid_scale = SCALES.get(sub_parts[2])
+        if valid_scale is None:
+            # Uncommon spellings such as "04" or "+4"
+            valid_scale = parse_scale(sub_parts[2])
+        scale = valid_scale
 
     return MemoryOperand(base=base, index=index, scale=scale, displacement=displacement)
 
 
+def parse_scale(text: str) -> Literal[1, 2, 4, 8]:
+    """Slow path for scale factors not spelled exactly as in `SCALES`."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise ValueError(f"Invalid scale factor: {text}")
+
+    scale = SCALES.get(str(value))
+    if scale is None:
+        raise ValueError(f"Invalid scale factor: {text}")
+    return scale
+
+
+def split_memory_operand(text: str) -> Tuple[str, Optional[str]]:
+    """
+    Splits "disp(base, index, scale)" into its displacement and the content
+    between the parentheses (None if there are no parentheses).
+    """
+    paren = text.find("(")
+    if paren < 0 or text[-1] != ")":
+        return text, None
+
+    return text[:paren], text[paren + 1 : -1]
+
+
 def build_blocks(elements: Iterator[Union[str, Instruction]]) -> List[BasicBlock]:
     """
     Groups the stream of instructions and labels into `BasicBlock` objects.
@@ -225,26 +279,22 @@ def build_blocks(elements: Iterator[Union[str, Instruction]]) -> List[BasicBlock
     current_block: Optional[BasicBlock] = None
 
     for item in elements:
-        match item:
-            case str(label_name):
-                if current_block and not current_block.instructions:
-                    current_block.name = label_name
-                else:
-                    current_block = BasicBlock(name=label_name)
-                    blocks.append(current_block)
-
-            case Instruction() as instr:
-                if current_block is None:
-                    current_block = BasicBlock(name=f"loc_{instr.line_number}")
-                    blocks.append(current_block)
+        if isinstance(item, str):
+            if current_block and not current_block.instructions:
+                current_block.name = item
+            else:
+                current_block = BasicBlock(name=item)
+                blocks.append(current_block)
+            continue
 
-                current_block.instructions.append(instr)
+        if current_block is None:
+            current_block = BasicBlock(name=f"loc_{item.line_number}")
+            blocks.append(current_block)
 
-                if is_terminator(instr.mnemonic):
-                    current_block = None
+        current_block.instructions.append(item)
 
-            case x:
-                assert_never(x)
+        if is_terminator(item.mnemonic_lower):
+            current_block = None
 
     return blocks
 
@@ -252,18 +302,31 @@ def build_blocks(elements: Iterator[Union[str, Instruction]]) -> List[BasicBlock
 def link_blocks(blocks: List[BasicBlock]) -> None:
     """
     Connects BasicBlocks to form a Control Flow Graph (CFG).
+    The jump target edge (if any) is appended before the fall-through edge,
+    so a block's fall-through, when present, is always its last successor.
     """
     block_map = {b.name: b for b in blocks}
 
-    for i, block in enumerate(blocks):
+    # Block physically following each block (None for the last)
+    next_blocks: List[Optional[BasicBlock]] = [*blocks[1:], None]
+
+    for block, next_block in zip(blocks, next_blocks):
         if not block.instructions:
             continue
 
         last_instr = block.instructions[-1]
-        mnem = last_instr.mnemonic.lower()
-        is_conditional = is_terminator(mnem) and not is_unconditional(mnem)
+        flags = classify_mnemonic(last_instr.mnemonic_lower)
+
+        if not flags:
+            # Block ends with an ordinary instruction: plain fall-through
+            if next_block is not None:
+                block.add_successor(next_block, EdgeType.DIRECT)
+            continue
 
-        if is_terminator(mnem) and not is_return(mnem) and last_instr.operands:
+        unconditional = flags & UNCONDITIONAL
+        is_conditional = flags & (TERMINATOR | UNCONDITIONAL) == TERMINATOR
+
+        if flags & TERMINATOR and not flags & RETURN and last_instr.operands:
             # Extract target label string from the operand
             target_op = last_instr.operands[0]
             target_label = None
@@ -278,27 +341,51 @@ def link_blocks(blocks: List[BasicBlock]) -> None:
 
             if target_label and target_label in block_map:
                 edge_type = EdgeType.TAKEN if is_conditional else EdgeType.DIRECT
-                block.successors.append((block_map[target_label], edge_type))
+                block.add_successor(block_map[target_label], edge_type)
 
-        if not is_unconditional(mnem):
-            if i + 1 < len(blocks):
-                edge_type = EdgeType.NOT_TAKEN if is_conditional else EdgeType.DIRECT
-                block.successors.append((blocks[i + 1], edge_type))
+        if not unconditional and next_block is not None:
+            edge_type = EdgeType.NOT_TAKEN if is_conditional else EdgeType.DIRECT
+            block.add_successor(next_block, edge_type)
 
 
-def is_terminator(mnemonic: str) -> bool:
-    m = mnemonic.lower()
-    return m.startswith("j") or m.startswith("b") or m in ["ret", "iret", "syscall"]
+TERMINATOR = 1
+UNCONDITIONAL = 2
+RETURN = 4
 
+BRANCH_PREFIXES = frozenset(("j", "b"))
 
-def is_unconditional(mnemonic: str) -> bool:
-    return mnemonic.lower() in ["jmp", "b", "ret", "iret", "syscall"]
+# Control-flow flags of the special-case mnemonics. This table is constant;
+# every other mnemonic is classified by `classify_by_prefix`.
+MNEMONIC_FLAGS: Dict[str, int] = {
+    "jmp": TERMINATOR | UNCONDITIONAL,
+    "b": TERMINATOR | UNCONDITIONAL,
+    "ret": TERMINATOR | UNCONDITIONAL | RETURN,
+    "iret": TERMINATOR | UNCONDITIONAL | RETURN,
+    "syscall": TERMINATOR | UNCONDITIONAL | RETURN,
+}
 
 
-def is_return(mnemonic: str) -> bool:
-    return mnemonic.lower() in ["ret", "iret", "syscall"]
+def classify_mnemonic(mnemonic: str) -> int:
+    """
+    Returns the control-flow flags of a mnemonic (0 for ordinary instructions).
+    Case-insensitive; callers with an already lowercased mnemonic (see
+    `Instruction.mnemonic_lower`) hit the special cases directly.
+    """
+    flags = MNEMONIC_FLAGS.get(mnemonic)
+    if flags is None:
+        flags = classify_by_prefix(mnemonic)
+    return flags
 
 
-def iter_source_lines(source_code: str) -> Iterator[Tuple[int, str]]:
-    for i, line in enumerate(source_code.splitlines()):
-        yield i + 1, line
+@lru_cache(maxsize=1024)
+def classify_by_prefix(mnemonic: str) -> int:
+    """Slow path of `classify_mnemonic`; memoized with a bounded cache."""
+    lowered = mnemonic.lower()
+    flags = MNEMONIC_FLAGS.get(lowered)
+    if flags is None:
+        flags = TERMINATOR if lowered[:1] in BRANCH_PREFIXES else 0
+    return flags
+
+
+def is_terminator(mnemonic: str) -> bool:
+    return bool(classify_mnemonic(mnemonic) & TERMINATOR)
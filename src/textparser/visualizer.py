@@ -1,16 +1,31 @@
 from .models import BasicBlock, EdgeType
 from collections import deque
-from typing import Set
+from typing import Iterator, List, Set, Tuple
 
 
 def human_readable(block: BasicBlock) -> str:
     lines = []
 
-    def _recurse(curr_block: BasicBlock, visited: Set[str], level: int, edge_type: str):
+    # Iterative DFS. `on_path` holds the names of the blocks on the current
+    # path (for cycle detection); an exit marker is pushed below each block's
+    # children to pop it off the path once they have all been printed.
+    on_path: Set[str] = set()
+    stack: List[Tuple[BasicBlock, int, str, bool]] = []
+
+    if block:
+        stack.append((block, 0, "Start", False))
+
+    while stack:
+        curr_block, level, edge_type, exiting = stack.pop()
+
+        if exiting:
+            on_path.discard(curr_block.name)
+            continue
+
         indent = "    " * level
         instr_indent = indent + "   "
 
-        is_cycle = curr_block.name in visited
+        is_cycle = curr_block.name in on_path
         cycle_msg = " (CYCLE DETECTED - Stopping)" if is_cycle else ""
         lines.append(f"{indent}|- [{edge_type}] -> {curr_block.name}{cycle_msg}")
 
@@ -18,59 +33,67 @@ def human_readable(block: BasicBlock) -> str:
             lines.append(f"{instr_indent} {instr}")
 
         if is_cycle:
-            return
-
-        new_visited = visited.copy()
-        new_visited.add(curr_block.name)
+            continue
 
-        if not curr_block.successors and not is_cycle:
+        if not curr_block.successors:
             lines.append(f"{indent}    (end of flow)")
+            continue
 
-        for succ_block, succ_edge in curr_block.successors:
-            _recurse(succ_block, new_visited, level + 1, succ_edge)
+        on_path.add(curr_block.name)
+        stack.append((curr_block, level, edge_type, True))
 
-    if block:
-        _recurse(block, set(), 0, "Start")
+        # Reversed so the first successor is popped (and printed) first
+        for succ_block, succ_edge in reversed(
+            list(zip(curr_block.successors, curr_block.successor_edges))
+        ):
+            stack.append((succ_block, level + 1, succ_edge, False))
 
     return "\n".join(lines)
 
 
+EDGE_TEMPLATE = '    "{}" -> "{}"{};'
+EDGE_ATTRS = {
+    EdgeType.TAKEN: ' [color="green" label="true" fontcolor="green"]',
+    EdgeType.NOT_TAKEN: ' [color="red" label="false" fontcolor="red"]',
+}
+DEFAULT_EDGE_ATTRS = ' [color="black"]'
+
+
 def dot_graph(start_block: BasicBlock) -> str:
-    output = [
-        "digraph asm_flow {",
-        '    node [shape=box fontname="Courier"];',
-        "    // Edge definitions: Green=True (Taken), Red=False (Not Taken)",
-    ]
+    return "\n".join(iter_dot_graph(start_block))
 
-    visited: Set[str] = set()
+
+def iter_dot_graph(start_block: BasicBlock) -> Iterator[str]:
+    """
+    Yields the lines of `dot_graph` one at a time (without newlines), so large
+    graphs can be streamed to a file without building the whole string.
+    """
+    yield "digraph asm_flow {"
+    yield '    node [shape=box fontname="Courier"];'
+    yield "    // Edge definitions: Green=True (Taken), Red=False (Not Taken)"
+
+    # Tracked by ID since `BasicBlock` is not hashable
+    visited: Set[int] = set()
     queue = deque([start_block])
 
     while queue:
         block = queue.popleft()
 
-        if block.name in visited:
+        if id(block) in visited:
             continue
-        visited.add(block.name)
+        visited.add(id(block))
 
         code = (
             "\\l".join(str(i).replace('"', '\\"') for i in block.instructions) + "\\l"
         )
         node_label = f"{block.name}\\n----------------\\n{code}"
-        output.append(f'    "{block.name}" [label="{node_label}"];')
-
-        for succ_block, edge_type in block.successors:
-            attrs = ""
-            if edge_type == EdgeType.TAKEN:
-                attrs = ' [color="green" label="true" fontcolor="green"]'
-            elif edge_type == EdgeType.NOT_TAKEN:
-                attrs = ' [color="red" label="false" fontcolor="red"]'
-            else:
-                attrs = ' [color="black"]'
+        yield f'    "{block.name}" [label="{node_label}"];'
 
-            output.append(f'    "{block.name}" -> "{succ_block.name}"{attrs};')
+        for succ_block, edge_type in zip(block.successors, block.successor_edges):
+            attrs = EDGE_ATTRS.get(edge_type, DEFAULT_EDGE_ATTRS)
+            yield EDGE_TEMPLATE.format(block.name, succ_block.name, attrs)
 
-            if succ_block.name not in visited:
+            if id(succ_block) not in visited:
                 queue.append(succ_block)
 
-    output.append("}")
-    return "\n".join(output)
+    yield "}"
@@ -158,3 +158,17 @@ def test_parse_data_return_structure():
     assert allocs_two[0].offset == 20
     # Should correspond to 3rd allocation (offset=30)
     assert allocs_two[1].offset == 30
+
+
+def test_parse_data_unlabelled_directive_without_allocation():
+    """
+    An unlabelled directive still registers the anonymous label, even when it
+    produces no allocation.
+    """
+    stub = StubMemoryManager()
+
+    result = parse_data(stub, ".data\n .align 4\nx: .int 1")
+
+    assert list(result) == ["__anonymous_data", "x"]
+    assert result["__anonymous_data"] == []
+    assert len(result["x"]) == 1
@@ -138,6 +138,26 @@ def test_substitute_term():
     assert e4.is_scalar
 
 
+def test_substitute_terms():
+    """Test batched, simultaneous symbol substitution."""
+    e = Expression("A") * 2 + "B" + "C" + 1
+
+    # A -> X + 3, B -> 4; C is untouched
+    e.substitute_terms({"A": Expression("X") + 3, "B": 4, "Z": 100})
+    assert str(e) == "C+2*X+11"
+
+    # Replacements are not substituted again
+    e = Expression("A") + "B"
+    e.substitute_terms({"A": Expression("B"), "B": 1})
+    assert str(e) == "B+1"
+
+    # Cancellation removes the term
+    e = Expression("A") + "B"
+    e.substitute_terms({"A": Expression("B") * -1})
+    assert e.is_scalar
+    assert str(e) == "0"
+
+
 def test_symbols_property():
     """Test the extraction of symbol names from an expression."""
 
@@ -172,6 +192,10 @@ def test_symbols_property():
     e = Expression.parse("base + index * 4")
     assert sorted(e.symbols) == ["base", "index"]
 
+    # 8. Non-copying view
+    assert set(e.symbol_names) == {"base", "index"}
+    assert "base" in e.symbol_names
+
 
 def test_cleanup_logic():
     """Ensure zero-coefficient terms are removed."""
@@ -267,6 +291,9 @@ def test_parse_parentheses():
     # Nested parens: ((1+2)*3) + 4 = 13
     assert str(Expression.parse("((1 + 2) * 3) + 4")) == "13"
 
+    # Constant subexpressions can scale a symbol
+    assert str(Expression.parse("(1 + 2) * A")) == "3*A"
+
 
 def test_parse_associativity():
     """Verify left-associativity for subtraction."""
@@ -284,6 +311,9 @@ def test_parse_unary_operators():
     # Double negative
     assert str(Expression.parse("-(-5)")) == "5"
 
+    # Negated literal used as a coefficient
+    assert str(Expression.parse("-2 * A")) == "-2*A"
+
 
 def test_parse_parser_complex_algebra():
     """Test complex mixed expressions via the parser."""
@@ -317,7 +347,7 @@ def test_parse_errors():
         Expression.parse("A % 2")
 
     # 3. Unbalanced parentheses (Missing closing)
-    with pytest.raises(ValueError):
+    with pytest.raises(ValueError, match="Unclosed '\\('"):
         Expression.parse("(A + 1")
 
     # 4. Unbalanced parentheses (Unexpected closing)
@@ -327,3 +357,36 @@ def test_parse_errors():
     # 5. Unexpected end of expression (Trailing operator)
     with pytest.raises(ValueError, match="Unexpected end"):
         Expression.parse("10 +")
+
+
+def test_parse_returns_independent_copies():
+    """Cached parses must not leak in-place mutations between callers."""
+    e1 = Expression.parse("A + 4")
+    e2 = Expression.parse("A + 4")
+    assert e1 is not e2
+
+    e1.substitute_term("A", 1)
+    assert str(e1) == "5"
+    assert str(e2) == "A+4"
+    assert str(Expression.parse(" A + 4 ")) == "A+4"
+
+
+def test_equality():
+    """Expressions compare by value, independent of term order."""
+    e1 = Expression("A") + "B" + 4
+    e2 = Expression.parse("4 + B + A")
+    assert e1 == e2
+
+    assert Expression("A") != Expression("A") + 1
+    assert Expression("A") - "A" == Expression(0)
+
+    # Comparisons with non-Expressions are not structural
+    assert Expression(0) != 0
+
+    # Mutation is reflected in equality
+    e1.substitute_term("A", 1)
+    assert e1 == Expression("B") + 5
+
+    # Mutable, so not hashable
+    with pytest.raises(TypeError):
+        hash(e1)
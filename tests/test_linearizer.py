@@ -0,0 +1,69 @@
+from linearizer import get_linearized_asm
+from memorymanager import MemoryManager
+
+
+def linearize(asm: str) -> list:
+    """Helper: linearizes a single-function source into printable lines."""
+    (func,) = get_linearized_asm(asm, MemoryManager(), "DATA")
+    return [str(item) for item in func.instructions]
+
+
+def test_connector_jump_to_next_label_is_dropped():
+    """
+    A fall-through into the block laid out next needs no connector jump.
+    """
+    asm = """
+.text
+main:
+    movl $1, %eax
+next:
+    ret
+"""
+    assert linearize(asm) == ["main", "movl $(1), %eax", "next", "ret"]
+
+
+def test_connector_jump_is_kept_when_target_is_elsewhere():
+    """
+    The not-taken path of a conditional jump that is not laid out next
+    still gets its connector jump.
+    """
+    asm = """
+.text
+main:
+    cmpl $1, %eax
+    jge far
+near:
+    incl %eax
+    ret
+far:
+    decl %eax
+    ret
+"""
+    assert linearize(asm) == [
+        "main",
+        "cmpl $(1), %eax",
+        "jge far",
+        "jmp near",
+        "far",
+        "decl %eax",
+        "ret",
+        "near",
+        "incl %eax",
+        "ret",
+    ]
+
+
+def test_source_jump_to_next_label_is_dropped():
+    """
+    A `jmp` written in the source is removed as well when its target label
+    ends up immediately after it.
+    """
+    asm = """
+.text
+main:
+    movl $1, %eax
+    jmp next
+next:
+    ret
+"""
+    assert linearize(asm) == ["main", "movl $(1), %eax", "next", "ret"]
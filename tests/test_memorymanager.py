@@ -79,6 +79,10 @@ def test_invalid_inputs():
     with pytest.raises(ValueError, match="Size must be positive"):
         mm.allocate_empty(-10, "bad_size")
 
+    # Alignment must be a power of two
+    with pytest.raises(ValueError, match="power of two"):
+        MemoryManager(alignment=3)
+
 
 def test_data_section_snapshot(snapshot):
     """
@@ -1,5 +1,11 @@
 import pytest
-from textparser import parse_cfg, visualizer
+from textparser import ImmediateOperand, MemoryOperand, parse_cfg, visualizer
+from textparser.parser import (
+    MNEMONIC_FLAGS,
+    RETURN,
+    UNCONDITIONAL,
+    classify_mnemonic,
+)
 
 
 EMPTY_ASM = """
@@ -173,3 +179,105 @@ def test_dot_graph_output(snapshot, case_name, asm_code):
 
     print(full_output)
     assert full_output == snapshot(name=f"{case_name}_dot")
+
+
+SHARED_OPERANDS_ASM = """
+.text
+main:
+    movl $x, %eax
+    movl $x, %ebx
+    movl x(%ebp), %ecx
+    movl x(%ebp), %edx
+    ret
+"""
+
+
+def test_operands_are_not_shared():
+    """
+    Mutating one instruction's operand expression must not leak into other
+    instructions with the same operand text, nor into a later parse.
+    """
+    (func,) = parse_cfg(SHARED_OPERANDS_ASM)
+    first_imm, second_imm, first_mem, second_mem, _ = func.entry_block.instructions
+
+    imm = first_imm.operands[0]
+    assert isinstance(imm, ImmediateOperand)
+    imm.value.substitute_term("x", 4)
+
+    mem = first_mem.operands[0]
+    assert isinstance(mem, MemoryOperand)
+    mem.displacement.substitute_term("x", 4)
+
+    assert str(first_imm) == "movl $(4), %eax"
+    assert str(second_imm) == "movl $(x), %ebx"
+    assert str(first_mem) == "movl 4(%ebp), %ecx"
+    assert str(second_mem) == "movl x(%ebp), %edx"
+
+    (reparsed,) = parse_cfg(SHARED_OPERANDS_ASM)
+    assert [str(i) for i in reparsed.entry_block.instructions[:3]] == [
+        "movl $(x), %eax",
+        "movl $(x), %ebx",
+        "movl x(%ebp), %ecx",
+    ]
+
+
+def test_comments_stop_at_any_line_break():
+    """A trailing comment must not swallow lines separated by '\\r' alone."""
+    asm = ".text\rmain:\r    movl $1, %eax # set\r    addl $2, %eax\r    ret\r"
+
+    (func,) = parse_cfg(asm)
+    instructions = func.entry_block.instructions
+
+    assert [i.mnemonic for i in instructions] == ["movl", "addl", "ret"]
+    assert [i.line_number for i in instructions] == [3, 4, 5]
+
+
+def test_mnemonic_classification_is_case_insensitive():
+    """Uppercase spellings classify like lowercase ones, before and after caching."""
+    for _ in range(2):
+        assert classify_mnemonic("JMP") & UNCONDITIONAL
+        assert classify_mnemonic("RET") & RETURN
+        assert classify_mnemonic("Jge") == classify_mnemonic("jge") != 0
+        assert classify_mnemonic("MOVL") == 0
+
+
+def test_scale_factor_spellings():
+    """Scale factors accept any integer spelling of 1, 2, 4 or 8."""
+    asm = """
+.text
+main:
+    movl (%eax,%ebx,4), %ecx
+    movl (%eax,%ebx,04), %ecx
+    movl (%eax,%ebx,+4), %ecx
+    ret
+"""
+    (func,) = parse_cfg(asm)
+    for instr in func.entry_block.instructions[:3]:
+        op = instr.operands[0]
+        assert isinstance(op, MemoryOperand)
+        assert op.scale == 4
+
+    with pytest.raises(ValueError, match="Invalid scale factor"):
+        parse_cfg(".text\nmain:\n    movl (%eax,%ebx,3), %ecx\n")
+
+    with pytest.raises(ValueError, match="Invalid scale factor"):
+        parse_cfg(".text\nmain:\n    movl (%eax,%ebx,x), %ecx\n")
+
+
+def test_set_mnemonic_updates_lowercase_form():
+    """Renaming an instruction keeps its lowercase mnemonic in sync."""
+    (func,) = parse_cfg(".text\nmain:\n    MOVL $1, %eax\n    ret\n")
+    instr = func.entry_block.instructions[0]
+    assert instr.mnemonic_lower == "movl"
+
+    instr.set_mnemonic("JMP")
+    assert instr.mnemonic_lower == "jmp"
+    assert classify_mnemonic(instr.mnemonic_lower) & UNCONDITIONAL
+
+
+def test_mnemonic_table_does_not_grow():
+    """Classifying arbitrary mnemonics leaves the special-case table untouched."""
+    before = dict(MNEMONIC_FLAGS)
+    for mnemonic in ("movl", "MOVL", "jge", "JGE", "Ret"):
+        classify_mnemonic(mnemonic)
+    assert MNEMONIC_FLAGS == before